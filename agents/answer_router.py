@@ -0,0 +1,90 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class AnswerRouter:
+    """
+    Answer Router
+    -------------
+    Chooses between the extractive fast path and the Generator Agent.
+
+    When the Synthesis Agent is confident the cited evidence already
+    answers the query, that evidence is returned directly and the LLM
+    call is skipped. Tracks how many queries took the fast path and an
+    estimate of the generation latency saved.
+
+    The saving per fast-path answer is the generator's mean observed call
+    latency, or `estimated_llm_latency_s` before any call has been
+    measured. With neither, the answer is counted as an unknown saving.
+    """
+
+    def __init__(self, synthesizer, generator, extractive: bool = True,
+                 estimated_llm_latency_s: Optional[float] = None):
+        self.synthesizer = synthesizer
+        self.generator = generator
+        self.extractive = extractive
+        self.estimated_llm_latency_s = estimated_llm_latency_s
+
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.extractive_answers = 0
+        self.latency_saved_s = 0.0
+        self.unmeasured_savings = 0
+
+    def answer(self, query: str, retrieved_passages: List[Dict], evidence_text: str) -> Dict:
+        assessment = self.synthesizer.assess_confidence(query, retrieved_passages)
+
+        if self.extractive and assessment["confident"]:
+            # Mean observed LLM latency is the time this query did not spend generating
+            saved = self.generator.metrics()["latency_mean_s"]
+            if saved is None:
+                saved = self.estimated_llm_latency_s
+            self._record(extractive=True, saved_s=saved)
+            answer = (
+                f"{evidence_text}\n\n"
+                "_Answered extractively from the retrieved evidence (no LLM call)._"
+            )
+            route = "extractive"
+        else:
+            route = "llm"
+            try:
+                answer = self.generator.generate(query=query, context=evidence_text)
+            finally:
+                # Failed LLM calls still count toward the total
+                self._record(extractive=False, saved_s=0.0)
+
+        stats = self.stats()
+        print(
+            f"⚡ Route: {route} ({assessment['reason']}) | "
+            f"{stats['extractive_answers']}/{stats['queries']} queries "
+            f"({stats['extractive_fraction']:.0%}) answered without LLM, "
+            f"~{stats['latency_saved_s']:.2f}s saved"
+            + (f" (+{stats['unmeasured_savings']} unknown)" if stats["unmeasured_savings"] else "")
+        )
+
+        return {
+            "answer": answer,
+            "route": route,
+            "assessment": assessment,
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "extractive_answers": self.extractive_answers,
+                "extractive_fraction": self.extractive_answers / self.queries if self.queries else 0.0,
+                "latency_saved_s": self.latency_saved_s,
+                "unmeasured_savings": self.unmeasured_savings,
+            }
+
+    def _record(self, extractive: bool, saved_s: Optional[float]):
+        with self._lock:
+            self.queries += 1
+            if not extractive:
+                return
+            self.extractive_answers += 1
+            if saved_s is None:
+                self.unmeasured_savings += 1
+            else:
+                self.latency_saved_s += saved_s
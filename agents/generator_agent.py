@@ -1,6 +1,13 @@
 import os
+from typing import Dict, Optional
 from dotenv import load_dotenv
-from groq import Groq
+
+from agents.generator_transport import (
+    GeneratorTransport,
+    GroqBackend,
+    StubBackend,
+    TransportConfig,
+)
 
 load_dotenv()
 
@@ -11,16 +18,26 @@ class GeneratorAgent:
     --------------------------
     Uses Groq-hosted LLMs for grounded generation.
     The model is STRICTLY limited to provided context.
+
+    Calls go through `GeneratorTransport` (pooled HTTP client, deadlines,
+    jittered retries, optional hedging). Set GENERATOR_BACKEND=stub to run
+    offline without a GROQ_API_KEY.
     """
 
-    def __init__(self, model: str = "llama-3.1-8b-instant"):
+    def __init__(self, model: str = "llama-3.1-8b-instant",
+                 config: Optional[TransportConfig] = None):
         self.model = model
+        config = config or TransportConfig.from_env()
 
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            raise EnvironmentError("GROQ_API_KEY not set")
+        if config.backend == "stub":
+            backend = StubBackend()
+        else:
+            api_key = os.getenv("GROQ_API_KEY")
+            if not api_key:
+                raise EnvironmentError("GROQ_API_KEY not set")
+            backend = GroqBackend(api_key=api_key, model=model, config=config)
 
-        self.client = Groq(api_key=api_key)
+        self.transport = GeneratorTransport(backend, config)
 
     def generate(self, query: str, context: str) -> str:
         system_prompt = (
@@ -44,13 +61,11 @@ INSTRUCTIONS:
 - Cite section names when possible
 """
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.0,
-        )
+        return self.transport.complete([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ])
 
-        return response.choices[0].message.content.strip()
\ No newline at end of file
+    def metrics(self) -> Dict:
+        """Per-call latency, retry and hedging counters."""
+        return self.transport.metrics.snapshot()
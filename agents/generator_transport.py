@@ -0,0 +1,352 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import groq
+import httpx
+
+
+class TransportError(Exception):
+    """
+    Raised by a backend when a single completion attempt fails.
+    `retryable` tells the transport whether another attempt may succeed.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _retry_after_s(headers) -> Optional[float]:
+    """Server-requested delay from retry-after-ms or retry-after (seconds)."""
+    for name, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / scale)
+        except ValueError:
+            # e.g. an HTTP-date Retry-After; fall back to jittered backoff
+            continue
+    return None
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass
+class TransportConfig:
+    """
+    Transport tuning knobs. Every field can be overridden through a
+    GENERATOR_* environment variable (see `from_env`).
+    """
+
+    backend: str = "groq"              # "groq" or "stub"
+    deadline_s: float = 30.0           # total budget for one generate() call
+    attempt_timeout_s: float = 15.0    # budget for a single HTTP attempt
+    max_retries: int = 3               # retries after the first attempt
+    backoff_base_s: float = 0.5
+    backoff_cap_s: float = 8.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry_s: float = 60.0
+    hedge: bool = False
+    hedge_min_samples: int = 20        # successful attempts needed before p95 is trusted
+    hedge_min_delay_s: float = 0.25
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        d = cls()
+        return cls(
+            backend=os.getenv("GENERATOR_BACKEND", d.backend).lower(),
+            deadline_s=_env_float("GENERATOR_DEADLINE_S", d.deadline_s),
+            attempt_timeout_s=_env_float("GENERATOR_ATTEMPT_TIMEOUT_S", d.attempt_timeout_s),
+            max_retries=_env_int("GENERATOR_MAX_RETRIES", d.max_retries),
+            backoff_base_s=_env_float("GENERATOR_BACKOFF_BASE_S", d.backoff_base_s),
+            backoff_cap_s=_env_float("GENERATOR_BACKOFF_CAP_S", d.backoff_cap_s),
+            max_connections=_env_int("GENERATOR_MAX_CONNECTIONS", d.max_connections),
+            max_keepalive=_env_int("GENERATOR_MAX_KEEPALIVE", d.max_keepalive),
+            keepalive_expiry_s=_env_float("GENERATOR_KEEPALIVE_EXPIRY_S", d.keepalive_expiry_s),
+            hedge=os.getenv("GENERATOR_HEDGE", "0").lower() in ("1", "true", "yes"),
+            hedge_min_samples=_env_int("GENERATOR_HEDGE_MIN_SAMPLES", d.hedge_min_samples),
+            hedge_min_delay_s=_env_float("GENERATOR_HEDGE_MIN_DELAY_S", d.hedge_min_delay_s),
+        )
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class GroqBackend:
+    """
+    Groq chat-completions backend over a pooled, keep-alive HTTP client.
+    SDK-level retries are disabled; the transport owns the retry policy.
+    """
+
+    def __init__(self, api_key: str, model: str, config: TransportConfig):
+        self.model = model
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive,
+                keepalive_expiry=config.keepalive_expiry_s,
+            ),
+            timeout=httpx.Timeout(config.attempt_timeout_s, connect=5.0),
+        )
+        self.client = groq.Groq(api_key=api_key, http_client=self._http, max_retries=0)
+
+    def complete(self, messages: List[Dict], timeout: float) -> str:
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.0,
+                timeout=timeout,
+            )
+        except groq.APIStatusError as e:
+            status = e.status_code
+            raise TransportError(
+                f"Groq returned HTTP {status}",
+                status_code=status,
+                retryable=status == 429 or status >= 500,
+                retry_after=_retry_after_s(e.response.headers),
+            ) from e
+        except groq.APIConnectionError as e:
+            # Also covers APITimeoutError
+            raise TransportError(f"Groq connection failed: {e}", retryable=True) from e
+        except groq.APIError as e:
+            # e.g. APIResponseValidationError: retrying will not help
+            raise TransportError(f"Groq request failed: {e}", retryable=False) from e
+
+        return response.choices[0].message.content.strip()
+
+
+class StubBackend:
+    """
+    Offline backend for local testing. Echoes the leading evidence from the
+    prompt context; latency and failure rate can be simulated.
+    """
+
+    model = "stub"
+
+    def __init__(self, latency_s: float = 0.0, failure_rate: float = 0.0):
+        self.latency_s = latency_s
+        self.failure_rate = failure_rate
+
+    def complete(self, messages: List[Dict], timeout: float) -> str:
+        time.sleep(min(self.latency_s, timeout))
+        if self.latency_s > timeout:
+            raise TransportError("Stub attempt timed out", retryable=True)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise TransportError("Stub simulated HTTP 503", status_code=503, retryable=True)
+
+        user_prompt = messages[-1]["content"]
+        context = user_prompt.split("CONTEXT:", 1)[-1].split("INSTRUCTIONS:", 1)[0].strip()
+        return f"[stub backend] {context[:1200]}".strip()
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+class TransportMetrics:
+    """
+    Thread-safe counters and latency windows for generator calls.
+    """
+
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()
+        self._call_latencies = deque(maxlen=window)
+        self._attempt_latencies = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+
+    def record_attempt(self, latency_s: float):
+        with self._lock:
+            self._attempt_latencies.append(latency_s)
+
+    def record_call(self, latency_s: float, retries: int, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            if ok:
+                self._call_latencies.append(latency_s)
+            else:
+                self.failures += 1
+
+    def record_hedge(self, won: bool = False):
+        with self._lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges_fired += 1
+
+    def attempt_p95(self, min_samples: int) -> Optional[float]:
+        with self._lock:
+            if len(self._attempt_latencies) < min_samples:
+                return None
+            return _percentile(list(self._attempt_latencies), 95)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = list(self._call_latencies)
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "hedges_fired": self.hedges_fired,
+                "hedge_wins": self.hedge_wins,
+                "latency_mean_s": sum(latencies) / len(latencies) if latencies else None,
+                "latency_p50_s": _percentile(latencies, 50),
+                "latency_p95_s": _percentile(latencies, 95),
+            }
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+# -----------------------------
+# Transport
+# -----------------------------
+class GeneratorTransport:
+    """
+    Generator Transport
+    -------------------
+    Wraps a backend with:
+    - A hard per-call deadline shared by all attempts
+    - Jittered exponential backoff on retryable errors (429 / 5xx / connection)
+    - Optional hedged requests fired after the observed p95 attempt latency
+    - Per-call latency and retry metrics
+
+    Hedged attempts run on a pool sized to the HTTP connection pool. When
+    no worker is free the attempt runs inline without a hedge, so queueing
+    never counts toward the hedge delay.
+    """
+
+    def __init__(self, backend, config: TransportConfig):
+        self.backend = backend
+        self.config = config
+        self.metrics = TransportMetrics()
+        workers = max(1, config.max_connections)
+        self._hedge_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="generator-hedge")
+        self._hedge_slots = threading.BoundedSemaphore(workers)
+
+    def complete(self, messages: List[Dict]) -> str:
+        cfg = self.config
+        start = time.monotonic()
+        deadline = start + cfg.deadline_s
+        retries = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                result = self._attempt(messages, min(cfg.attempt_timeout_s, remaining))
+            except TransportError as e:
+                delay = self._backoff(retries, e.retry_after)
+                out_of_budget = time.monotonic() + delay >= deadline
+                if not e.retryable or retries >= cfg.max_retries or out_of_budget:
+                    elapsed = time.monotonic() - start
+                    self.metrics.record_call(elapsed, retries, ok=False)
+                    print(f"❌ Generator call failed after {retries + 1} attempt(s), {elapsed:.2f}s: {e}")
+                    raise RuntimeError(f"Generator call failed after {retries + 1} attempt(s): {e}") from e
+
+                retries += 1
+                print(f"⚠️ Generator attempt failed ({e}), retry {retries} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                # Unmapped backend error: still count the failed call
+                elapsed = time.monotonic() - start
+                self.metrics.record_call(elapsed, retries, ok=False)
+                print(f"❌ Generator call failed after {retries + 1} attempt(s), {elapsed:.2f}s: {e}")
+                raise
+
+            elapsed = time.monotonic() - start
+            self.metrics.record_call(elapsed, retries, ok=True)
+            print(f"🤖 Generator call: {elapsed:.2f}s, {retries} retr{'y' if retries == 1 else 'ies'}")
+            return result
+
+    def _backoff(self, retries: int, retry_after: Optional[float]) -> float:
+        # Full jitter; honour Retry-After when the server asks for longer
+        cap = min(self.config.backoff_cap_s, self.config.backoff_base_s * (2 ** retries))
+        delay = random.uniform(0, cap)
+        return max(delay, retry_after or 0.0)
+
+    def _timed(self, messages: List[Dict], timeout: float) -> Tuple[str, float]:
+        t0 = time.monotonic()
+        result = self.backend.complete(messages, timeout=timeout)
+        return result, time.monotonic() - t0
+
+    def _submit(self, messages: List[Dict], timeout: float) -> Optional[Future]:
+        """Runs an attempt on the hedge pool, or returns None if no worker is free."""
+        if not self._hedge_slots.acquire(blocking=False):
+            return None
+        future = self._hedge_pool.submit(self._timed, messages, timeout)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+
+    def _attempt(self, messages: List[Dict], timeout: float) -> str:
+        if timeout <= 0:
+            raise TransportError("Generator deadline exceeded", retryable=False)
+
+        hedge_delay = self._hedge_delay()
+        primary = None
+        if hedge_delay is not None and hedge_delay < timeout:
+            primary = self._submit(messages, timeout)
+        if primary is None:
+            result, latency = self._timed(messages, timeout)
+            self.metrics.record_attempt(latency)
+            return result
+
+        done, _ = wait([primary], timeout=hedge_delay)
+        hedge = None if done else self._submit(messages, timeout - hedge_delay)
+        if hedge is not None:
+            # Primary is slower than p95: race a second request against it.
+            # The loser cannot be cancelled mid-flight; it finishes within its timeout.
+            self.metrics.record_hedge()
+
+        pending = {primary, hedge} - {None}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, latency = future.result()
+                except TransportError as e:
+                    last_error = e
+                    continue
+                # Only the winner feeds p95; losers would skew it upwards
+                self.metrics.record_attempt(latency)
+                if future is hedge:
+                    self.metrics.record_hedge(won=True)
+                return result
+        raise last_error
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.config.hedge:
+            return None
+        p95 = self.metrics.attempt_p95(self.config.hedge_min_samples)
+        if p95 is None:
+            return None
+        return max(p95, self.config.hedge_min_delay_s)
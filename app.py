@@ -14,6 +14,8 @@ from agents.planner import PlannerAgent
 from agents.retriever_agent import RetrievalAgent
 from agents.synthesis_agent import SynthesisAgent
 from agents.generator_agent import GeneratorAgent
+from agents.answer_router import AnswerRouter
+from retrieval.retriever import current_version
 
 
 # -----------------------------
@@ -79,10 +81,45 @@ def load_agents():
     retriever = RetrievalAgent(top_k=5)
     synthesizer = SynthesisAgent()
     generator = GeneratorAgent()
-    return planner, retriever, synthesizer, generator
+    router = AnswerRouter(synthesizer, generator)
+    return planner, retriever, synthesizer, generator, router
 
 
-planner, retriever, synthesizer, generator = load_agents()
+planner, retriever, synthesizer, generator, router = load_agents()
+
+# -----------------------------
+# Sidebar – Live Metrics
+# -----------------------------
+# Rendered now and re-rendered at the end of the run, so the query
+# just answered is counted
+metrics_panel = st.sidebar.empty()
+
+
+def render_metrics():
+    panel = metrics_panel.container()
+    panel.markdown("---")
+    panel.write("**Index version:**", current_version())
+    panel.markdown("### 📈 Generator Metrics")
+    gen_metrics = generator.metrics()
+    panel.write("**Calls:**", gen_metrics["calls"], "| **Failures:**", gen_metrics["failures"])
+    panel.write("**Retries:**", gen_metrics["retries"])
+    panel.write("**Hedges fired / won:**", f"{gen_metrics['hedges_fired']} / {gen_metrics['hedge_wins']}")
+    if gen_metrics["latency_p50_s"] is not None:
+        panel.write(
+            "**Latency p50 / p95:**",
+            f"{gen_metrics['latency_p50_s']:.2f}s / {gen_metrics['latency_p95_s']:.2f}s"
+        )
+
+    route_stats = router.stats()
+    panel.write(
+        "**Answered without LLM:**",
+        f"{route_stats['extractive_answers']}/{route_stats['queries']} "
+        f"({route_stats['extractive_fraction']:.0%}), ~{route_stats['latency_saved_s']:.2f}s saved"
+        + (f" (+{route_stats['unmeasured_savings']} unknown)" if route_stats["unmeasured_savings"] else "")
+    )
+
+
+render_metrics()
 
 # -----------------------------
 # User Query Input
@@ -161,11 +198,18 @@ if run_button and query.strip():
     # -----------------------------
     st.markdown("## 🤖 Generator Agent (Grounded Answer)")
 
-    final_answer = generator.generate(
+    routed = router.answer(
         query=query,
-        context=evidence_text
+        retrieved_passages=retrieved_passages,
+        evidence_text=evidence_text
     )
+    final_answer = routed["answer"]
 
+    if routed["route"] == "extractive":
+        st.info(
+            "⚡ High-confidence retrieval: answered directly from the synthesized evidence, "
+            "LLM call skipped."
+        )
     st.success("✅ Final Answer Generated (Grounded & Cited)")
     st.markdown(final_answer)
 
@@ -185,3 +229,5 @@ st.markdown("---")
 st.caption(
     "Agentic RAG Assistant | Built for Assignment Evaluation & Technical Review"
 )
+
+render_metrics()
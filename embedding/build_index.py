@@ -1,35 +1,20 @@
 import chromadb
-from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 import json
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
-VECTOR_DIR = os.path.join(PROJECT_ROOT, "vectorstore", "chroma_db")
+sys.path.insert(0, PROJECT_ROOT)
+
+from retrieval import snapshots
 
 COLLECTION_NAME = "aws_rag_chunks"
-os.makedirs(VECTOR_DIR, exist_ok=True)
 
 print("🔢 Loading embedding model...")
 model = SentenceTransformer("all-MiniLM-L6-v2")
 
-client = chromadb.PersistentClient(
-    path=VECTOR_DIR
-)
-
-# 🔥 CRITICAL FIX
-try:
-    client.delete_collection(name=COLLECTION_NAME)
-    print("🗑️ Existing collection deleted")
-except Exception:
-    pass
-
-collection = client.get_or_create_collection(
-    name=COLLECTION_NAME,
-    metadata={"hnsw:space": "cosine"}
-)
-
 print("📂 Loading chunks...")
 with open(os.path.join(PROJECT_ROOT, "output", "chunks.json"), "r", encoding="utf-8") as f:
     chunks = json.load(f)
@@ -53,12 +38,57 @@ embeddings = model.encode(
     show_progress_bar=True
 )
 
-collection.add(
-    documents=documents,
-    metadatas=metadatas,
-    embeddings=embeddings.tolist(),
-    ids=ids
-)
 
-print("✅ Vector index created successfully!")
+def build(snapshot_dir: str):
+    client = chromadb.PersistentClient(
+        path=snapshot_dir
+    )
+
+    collection = client.get_or_create_collection(
+        name=COLLECTION_NAME,
+        metadata={"hnsw:space": "cosine"}
+    )
+
+    collection.add(
+        documents=documents,
+        metadatas=metadatas,
+        embeddings=embeddings.tolist(),
+        ids=ids
+    )
+    return collection
+
+
+def validate(collection):
+    count = collection.count()
+    if count == 0 or count != len(documents):
+        raise RuntimeError(f"❌ Snapshot has {count} vectors, expected {len(documents)}")
+
+    # A stored passage must retrieve itself (or an identical duplicate)
+    probe = collection.query(
+        query_embeddings=[embeddings[0].tolist()],
+        n_results=1,
+        include=["distances"]
+    )
+    if not probe["ids"][0] or probe["distances"][0][0] > 1e-3:
+        raise RuntimeError("❌ Snapshot failed self-retrieval check")
+
+
+# Build into a fresh snapshot; the live index is untouched until publish
+version, snapshot_dir = snapshots.new_snapshot()
+print(f"📦 Building index snapshot: {version}")
+
+try:
+    collection = build(snapshot_dir)
+    print("🧪 Validating snapshot...")
+    validate(collection)
+    snapshots.mark_valid(version)
+except BaseException:
+    # Includes Ctrl-C: never leave a partial snapshot behind
+    snapshots.discard(version)
+    raise
+
+snapshots.publish(version)
+snapshots.prune(keep=3)
+
+print(f"✅ Vector index created successfully! Live version: {version}")
 print("🔎 Collection vector count:", collection.count())
\ No newline at end of file
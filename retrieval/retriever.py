@@ -1,34 +1,157 @@
 import chromadb
-import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
-VECTOR_DIR = os.path.join(PROJECT_ROOT, "vectorstore", "chroma_db")
+from retrieval import snapshots
 
 COLLECTION_NAME = "aws_rag_chunks"
+CACHE_SIZE = 256
 
-client = chromadb.PersistentClient(path=VECTOR_DIR)
 
-collection = client.get_or_create_collection(
-    name=COLLECTION_NAME,
-    metadata={"hnsw:space": "cosine"}
-)
+class _LiveIndex:
+    """
+    Serves the snapshot named by vectorstore/CURRENT and hot-swaps to a
+    newly published one on the next query, without a restart.
 
-count = collection.count()
-print(f"🔎 Collection vector count: {count}")
+    Queries hold a reference to the collection they started with, so a
+    swap never interrupts an in-flight query. The replaced snapshot's
+    Chroma client is released once its last in-flight query finishes.
+    Cached results are keyed by snapshot version and dropped when the
+    version changes.
+    """
 
-if count == 0:
-    raise RuntimeError("❌ Chroma collection is EMPTY")
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = snapshots.pointer_signature()
+        version, path = snapshots.current_snapshot()
+        # (version, collection, client), always replaced in a single store
+        self._live = (version, *self._open(version, path))
+        self._inflight = {}
+        self._retired = {}
+        self._cache = OrderedDict()
 
-print(f"✅ Chroma collection ready: {COLLECTION_NAME}")
+    def _open(self, version: str, path: str):
+        client = chromadb.PersistentClient(path=path)
+        collection = client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata={"hnsw:space": "cosine"}
+        )
+
+        count = collection.count()
+        print(f"🔎 Collection vector count: {count} (index version: {version})")
+
+        if count == 0:
+            raise RuntimeError(f"❌ Chroma collection is EMPTY (index version: {version})")
+
+        print(f"✅ Chroma collection ready: {COLLECTION_NAME}")
+        return collection, client
+
+    def current(self):
+        """Returns (version, collection, client), switching first if CURRENT moved."""
+        signature = snapshots.pointer_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._swap(signature)
+        return self._live
+
+    @contextmanager
+    def acquire(self):
+        """Pins the live snapshot for the duration of one query."""
+        self.current()
+        with self._lock:
+            live = self._live
+            version = live[0]
+            self._inflight[version] = self._inflight.get(version, 0) + 1
+        try:
+            yield live
+        finally:
+            with self._lock:
+                self._inflight[version] -= 1
+                if self._inflight[version] == 0:
+                    del self._inflight[version]
+                    retired = self._retired.pop(version, None)
+                    if retired is not None:
+                        self._release(version, retired)
+
+    def _swap(self, signature):
+        # Record the signature up front so a bad pointer is tried only once
+        self._signature = signature
+        version, path = snapshots.current_snapshot()
+        old_version, _, old_client = self._live
+        if version == old_version:
+            return
+
+        try:
+            collection, client = self._open(version, path)
+        except Exception as e:
+            # Keep serving the previous version rather than dropping queries
+            print(f"⚠️ Could not switch to index version {version}: {e}")
+            return
+
+        print(f"🔁 Index hot-swapped: {old_version} → {version}")
+        self._live = (version, collection, client)
+        self._cache.clear()
+        # Rolled back to a version still pinned by old queries: keep it open
+        self._retired.pop(version, None)
+
+        if old_version in self._inflight:
+            self._retired[old_version] = old_client
+        else:
+            self._release(old_version, old_client)
+
+    def _release(self, version: str, client):
+        """
+        Drops Chroma's cached System (and its HNSW index) for a replaced
+        snapshot. Chroma caches one System per path and has no public
+        per-path release, so this reaches into the shared client cache.
+        """
+        try:
+            system = client._identifier_to_system.pop(client._identifier, None)
+            if system is not None:
+                system.stop()
+            print(f"♻️ Released index version: {version}")
+        except Exception as e:
+            print(f"⚠️ Could not release index version {version}: {e}")
+
+    def cache_get(self, key):
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+            return hit
+
+    def cache_put(self, key, value):
+        with self._lock:
+            # Drop results from a query that finished after a swap
+            if key[0] != self._live[0]:
+                return
+            self._cache[key] = value
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+
+index = _LiveIndex()
+
+
+def current_version() -> str:
+    return index.current()[0]
 
 
 def retrieve(query: str, section: str = None, top_k: int = 5):
-    results = collection.query(
-        query_texts=[query],
-        n_results=top_k * 3,
-        include=["documents", "metadatas", "distances"]
-    )
+    with index.acquire() as (version, collection, _):
+        key = (version, query, section, top_k)
+        cached = index.cache_get(key)
+        if cached is not None:
+            # Callers annotate results in place
+            return [dict(r) for r in cached]
+
+        results = collection.query(
+            query_texts=[query],
+            n_results=top_k * 3,
+            include=["documents", "metadatas", "distances"]
+        )
 
     retrieved = []
     for i in range(len(results["documents"][0])):
@@ -45,4 +168,5 @@ def retrieve(query: str, section: str = None, top_k: int = 5):
         if len(retrieved) >= top_k:
             break
 
+    index.cache_put(key, [dict(r) for r in retrieved])
     return retrieved
\ No newline at end of file
@@ -0,0 +1,150 @@
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+VECTORSTORE_DIR = os.path.join(PROJECT_ROOT, "vectorstore")
+
+# Each build writes a new snapshot; CURRENT names the one being served
+# and PREVIOUS the one it replaced.
+SNAPSHOT_ROOT = os.path.join(VECTORSTORE_DIR, "snapshots")
+POINTER_PATH = os.path.join(VECTORSTORE_DIR, "CURRENT")
+PREVIOUS_PATH = os.path.join(VECTORSTORE_DIR, "PREVIOUS")
+
+# Written into a snapshot once it passes validation; only marked
+# snapshots can be published or count toward prune's `keep`.
+VALID_MARKER = ".validated"
+
+# Unmarked snapshots older than this are treated as abandoned builds
+STALE_BUILD_S = 6 * 3600
+
+# Served when no snapshot has been published yet
+LEGACY_VERSION = "legacy"
+LEGACY_DIR = os.path.join(VECTORSTORE_DIR, "chroma_db")
+
+
+def new_snapshot() -> Tuple[str, str]:
+    """Returns (version, path) for a fresh, empty snapshot directory."""
+    # Nanosecond stamp so names sort in creation order, even within a second
+    now_ns = time.time_ns()
+    stamp = datetime.fromtimestamp(now_ns // 10**9, timezone.utc).strftime("%Y%m%dT%H%M%S")
+    version = f"v{stamp}.{now_ns % 10**9:09d}Z"
+    path = snapshot_path(version)
+    os.makedirs(path)
+    return version, path
+
+
+def snapshot_path(version: str) -> str:
+    if version == LEGACY_VERSION:
+        return LEGACY_DIR
+    return os.path.join(SNAPSHOT_ROOT, version)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_atomic(path: str, text: str):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_pointer() -> Optional[str]:
+    return _read(POINTER_PATH)
+
+
+def read_previous() -> Optional[str]:
+    return _read(PREVIOUS_PATH)
+
+
+def mark_valid(version: str):
+    """Records that `version` passed validation and may be published."""
+    _write_atomic(os.path.join(snapshot_path(version), VALID_MARKER), version)
+
+
+def is_valid(version: str) -> bool:
+    return os.path.isfile(os.path.join(snapshot_path(version), VALID_MARKER))
+
+
+def pointer_signature() -> Optional[Tuple[int, int]]:
+    """Cheap change detector for CURRENT: (inode, mtime_ns), or None if absent."""
+    try:
+        st = os.stat(POINTER_PATH)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def current_snapshot() -> Tuple[str, str]:
+    """Returns (version, path) of the snapshot that should be served."""
+    version = read_pointer() or LEGACY_VERSION
+    return version, snapshot_path(version)
+
+
+def publish(version: str):
+    """
+    Atomically points CURRENT at `version`. Readers see either the old
+    or the new pointer, never a partial write. The replaced version is
+    recorded in PREVIOUS so prune() keeps it for processes still on it.
+    """
+    if not os.path.isdir(snapshot_path(version)):
+        raise FileNotFoundError(f"❌ Snapshot not found: {version}")
+    if not is_valid(version):
+        raise RuntimeError(f"❌ Snapshot has not passed validation: {version}")
+
+    previous = read_pointer()
+    if previous and previous != version:
+        _write_atomic(PREVIOUS_PATH, previous)
+    _write_atomic(POINTER_PATH, version)
+
+
+def discard(version: str):
+    """Removes an unpublished snapshot (e.g. one that failed validation)."""
+    if version != LEGACY_VERSION and version != read_pointer():
+        shutil.rmtree(snapshot_path(version), ignore_errors=True)
+
+
+def prune(keep: int = 3):
+    """
+    Deletes old snapshots, keeping the newest `keep` validated ones plus
+    CURRENT and PREVIOUS. PREVIOUS stays because a running process that
+    could not switch to CURRENT keeps serving it.
+
+    Unvalidated snapshots never count toward `keep`; they are removed
+    only once older than STALE_BUILD_S, so an in-progress build survives.
+    """
+    if not os.path.isdir(SNAPSHOT_ROOT):
+        return
+
+    protected = {read_pointer(), read_previous()}
+    versions = sorted(
+        (v for v in os.listdir(SNAPSHOT_ROOT) if os.path.isdir(snapshot_path(v))),
+        reverse=True,
+    )
+
+    valid = [v for v in versions if is_valid(v)]
+    unvalidated = [v for v in versions if v not in valid]
+
+    for version in valid[keep:]:
+        if version not in protected:
+            shutil.rmtree(snapshot_path(version), ignore_errors=True)
+            print(f"🗑️ Pruned old snapshot: {version}")
+
+    now = time.time()
+    for version in unvalidated:
+        if version in protected:
+            continue
+        if now - os.path.getmtime(snapshot_path(version)) > STALE_BUILD_S:
+            shutil.rmtree(snapshot_path(version), ignore_errors=True)
+            print(f"🗑️ Removed abandoned build: {version}")
@@ -2,6 +2,7 @@ from agents.planner import PlannerAgent
 from agents.retriever_agent import RetrievalAgent
 from agents.synthesis_agent import SynthesisAgent
 from agents.generator_agent import GeneratorAgent
+from agents.answer_router import AnswerRouter
 
 
 query = "Compare fully managed RAG options with custom architectures"
@@ -10,6 +11,7 @@ planner = PlannerAgent()
 retriever = RetrievalAgent(top_k=5)
 synthesizer = SynthesisAgent()
 generator = GeneratorAgent()
+router = AnswerRouter(synthesizer, generator)
 
 plan = planner.plan(query)
 retrieval_output = retriever.retrieve_for_plan(plan)
@@ -21,11 +23,12 @@ evidence_text = synthesizer.synthesize(
 )
 
 
-# Step 2: LLM-based generation (grounded)
-final_answer = generator.generate(
+# Step 2: grounded answer (extractive fast path or LLM generation)
+final_answer = router.answer(
     query=query,
-    context=evidence_text
-)
+    retrieved_passages=retrieval_output["results"],
+    evidence_text=evidence_text
+)["answer"]
 
 print("\n" + "=" * 80)
 print(final_answer)